@@ -7,7 +7,7 @@ This example shows how to:
 3. Have the agent automatically call the function when needed
 """
 
-import asyncio
+from joker_agent.event_loop import run
 from joker_agent.weather_agent import WeatherAgent
 
 
@@ -20,9 +20,11 @@ async def main() -> None:
     user_query = "What's the weather like in Seattle?"
     print(f"\nUser: {user_query}")
     
-    result = await agent.run(user_query)
-    print(f"Agent: {result}\n")
+    print("Agent: ", end="", flush=True)
+    async for chunk in agent.run_stream(user_query):
+        print(chunk, end="", flush=True)
+    print("\n")
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
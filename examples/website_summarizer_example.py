@@ -8,7 +8,8 @@ This example shows how to:
 4. Summarize the content into a bulleted list with the second agent
 """
 
-import asyncio
+from joker_agent.event_loop import run
+from joker_agent.http_client import close_session
 from joker_agent.website_summarizer_workflow import WebsiteSummarizerWorkflow
 
 
@@ -25,7 +26,10 @@ async def main() -> None:
     print(f"{'='*60}\n")
     
     # Run the workflow (verbose=False for cleaner output)
-    summary = await workflow.run(url, verbose=False)
+    try:
+        summary = await workflow.run(url, verbose=False)
+    finally:
+        await close_session()
     
     print("Summary:")
     print(summary)
@@ -33,4 +37,4 @@ async def main() -> None:
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -0,0 +1,12 @@
+import functools
+
+from dotenv import load_dotenv
+
+
+@functools.lru_cache(maxsize=None)
+def _init_env() -> None:
+    """Load settings from .env once per process."""
+    load_dotenv()
+
+
+_init_env()
@@ -1,26 +1,56 @@
-from typing import Optional
-import os
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import DefaultAzureCredential
-from dotenv import load_dotenv
+from joker_agent.azure_client import get_shared_client
+from joker_agent.llm_cache import LLMCache, get_llm_cache
 
-load_dotenv()
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
 
 
 SYSTEM_PROMPT = "You are good at telling jokes."
+# Stable key so Azure OpenAI reuses the cached system prompt prefix across requests
+PROMPT_CACHE_KEY = "joker-sys-v1"
+# Jokes don't go stale, so cached responses never expire
+CACHE_TTL = None
 
 
 class JokerAgent:
-    def __init__(self, *, credential: Optional[DefaultAzureCredential] = None) -> None:
-        # AzureOpenAIChatClient reads AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_CHAT_DEPLOYMENT_NAME, and optional API key.
-        self.credential = credential or DefaultAzureCredential()
-        # Read endpoint from .env via AZURE_OPENAI_ENDPOINT for consistency with Azure OpenAI clients.
-        # AZURE_AI_PROJECT_ENDPOINT="https://hosted-agent-deployment.services.ai.azure.com"
-        self.client = AzureOpenAIChatClient(credential=self.credential, endpoint="https://hosted-agent-deployment.services.ai.azure.com")
-        self.agent = self.client.create_agent(instructions=SYSTEM_PROMPT)
+    def __init__(self, *, client: Optional["AzureOpenAIChatClient"] = None, cache: Optional[LLMCache] = None) -> None:
+        # Use the shared Azure OpenAI Chat Client unless one is provided
+        self.client = client or get_shared_client()
+        self.agent = self.client.create_agent(
+            instructions=SYSTEM_PROMPT,
+            user=PROMPT_CACHE_KEY,
+            additional_chat_options={"extra_body": {"prompt_cache_key": PROMPT_CACHE_KEY}},
+        )
+        self.cache = cache or get_llm_cache()
 
     async def run(self, user_prompt: str) -> str:
-        response = await self.agent.run(user_prompt)
+        key = LLMCache.make_key(system_prompt=SYSTEM_PROMPT, prompt=user_prompt)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
 
-        return response.text if response.text else ""
+        response = await self.agent.run(user_prompt)
+        text = response.text if response.text else ""
+        if text:
+            await self.cache.set(key, text, ttl=CACHE_TTL)
+
+        return text
+
+    async def run_stream(self, user_prompt: str) -> AsyncIterator[str]:
+        key = LLMCache.make_key(system_prompt=SYSTEM_PROMPT, prompt=user_prompt)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async for update in self.agent.run_stream(user_prompt):
+            if update.text:
+                chunks.append(update.text)
+                yield update.text
+
+        text = "".join(chunks)
+        if text:
+            await self.cache.set(key, text, ttl=CACHE_TTL)
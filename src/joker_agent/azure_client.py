@@ -0,0 +1,144 @@
+from typing import TYPE_CHECKING, Any, Dict, Optional
+import json
+import os
+import time
+
+from azure.core.credentials import AccessToken
+
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
+    from azure.core.credentials import TokenCredential
+
+
+# AZURE_AI_PROJECT_ENDPOINT="https://hosted-agent-deployment.services.ai.azure.com"
+AZURE_ENDPOINT = "https://hosted-agent-deployment.services.ai.azure.com"
+
+# Access tokens are persisted here so they survive process restarts
+TOKEN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "joker-agent", "tokens.json")
+# Refresh tokens this many seconds before they expire
+TOKEN_REFRESH_MARGIN = 300
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+_CRED: Optional["CachedTokenCredential"] = None
+_CLIENT: Optional["AzureOpenAIChatClient"] = None
+
+
+class CachedTokenCredential:
+    """Credential wrapper that reuses access tokens until they are about to expire.
+
+    Tokens are kept in memory and written to a user-only file, so later
+    processes reuse them instead of walking the credential chain again
+    (which for AzureCliCredential means spawning ``az``). Tokens are keyed
+    by the signed-in identity as well as the scopes, so switching accounts
+    with ``az login`` or the AZURE_* environment variables fetches a new one.
+    """
+
+    def __init__(self, credential: "TokenCredential", *, path: str = TOKEN_CACHE_PATH) -> None:
+        """Initialize the wrapper.
+
+        Args:
+            credential: The credential used when no valid cached token exists
+            path: File used to persist tokens across processes
+        """
+        self.credential = credential
+        self.path = path
+        self._tokens: Dict[str, AccessToken] = self._load()
+
+    def get_token(
+        self,
+        *scopes: str,
+        claims: Optional[str] = None,
+        tenant_id: Optional[str] = None,
+        **kwargs: Any,
+    ) -> AccessToken:
+        """Return a cached access token for the scopes, fetching a new one when needed."""
+        if claims:
+            # Claims challenges always require a fresh token
+            return self.credential.get_token(*scopes, claims=claims, tenant_id=tenant_id, **kwargs)
+
+        key = " ".join(sorted(scopes)) + (f"@{tenant_id}" if tenant_id else "") + f"#{_identity()}"
+        token = self._tokens.get(key)
+        if token is None or token.expires_on - TOKEN_REFRESH_MARGIN <= time.time():
+            token = self.credential.get_token(*scopes, tenant_id=tenant_id, **kwargs)
+            self._tokens[key] = token
+            self._save()
+        return token
+
+    def close(self) -> None:
+        """Close the wrapped credential."""
+        self.credential.close()
+
+    def _load(self) -> Dict[str, AccessToken]:
+        """Read persisted tokens, ignoring a missing or unreadable cache file."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            return {key: AccessToken(token, int(expires_on)) for key, (token, expires_on) in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def _save(self) -> None:
+        """Persist tokens to a file readable only by the current user."""
+        now = time.time()
+        data = {key: [token.token, token.expires_on] for key, token in self._tokens.items() if token.expires_on > now}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+        except OSError:
+            # Persistence is best effort; the in-memory cache still works
+            pass
+
+
+def _identity() -> str:
+    """Describe the identity DefaultAzureCredential will sign in as, without acquiring a token.
+
+    Combines the service principal, managed identity and user settings from
+    the environment with the default Azure CLI account.
+    """
+    parts = [os.getenv(name, "") for name in ("AZURE_CLIENT_ID", "AZURE_TENANT_ID", "AZURE_USERNAME")]
+    config_dir = os.getenv("AZURE_CONFIG_DIR", os.path.join(os.path.expanduser("~"), ".azure"))
+    try:
+        with open(os.path.join(config_dir, "azureProfile.json"), encoding="utf-8-sig") as f:
+            subscriptions = json.load(f).get("subscriptions", [])
+        account = next((sub for sub in subscriptions if sub.get("isDefault")), {})
+        parts += [account.get("user", {}).get("name", ""), account.get("tenantId", "")]
+    except (OSError, ValueError, AttributeError):
+        pass
+    return "|".join(parts)
+
+
+def get_shared_credential() -> CachedTokenCredential:
+    """Return the process-wide Azure credential, creating it on first use."""
+    global _CRED
+    if _CRED is None:
+        # Imported lazily so importing an agent module does not load the Azure SDK
+        from azure.identity import DefaultAzureCredential
+
+        _CRED = CachedTokenCredential(DefaultAzureCredential(exclude_interactive_browser_credential=True))
+    return _CRED
+
+
+def get_shared_client() -> "AzureOpenAIChatClient":
+    """Return the process-wide Azure OpenAI chat client, creating it on first use.
+
+    Sharing one client across agents reuses its token and HTTP connection
+    pool instead of acquiring a token and opening connections per agent.
+    The client gets a token provider rather than the credential itself, so
+    it asks for a fresh token whenever the current one is about to expire.
+    AzureOpenAIChatClient reads AZURE_OPENAI_CHAT_DEPLOYMENT_NAME and the
+    optional API key from the environment.
+
+    Returns:
+        The shared AzureOpenAIChatClient
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        # Imported lazily so importing an agent module does not load the agent framework
+        from agent_framework.azure import AzureOpenAIChatClient
+        from azure.identity import get_bearer_token_provider
+
+        token_provider = get_bearer_token_provider(get_shared_credential(), COGNITIVE_SERVICES_SCOPE)
+        _CLIENT = AzureOpenAIChatClient(ad_token_provider=token_provider, endpoint=AZURE_ENDPOINT)
+    return _CLIENT
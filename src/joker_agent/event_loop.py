@@ -0,0 +1,26 @@
+from typing import Any, Coroutine, TypeVar
+import asyncio
+import sys
+
+
+T = TypeVar("T")
+
+
+def run(main: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion on the fastest available event loop.
+
+    Uses uvloop where it is available (everywhere except Windows) and falls
+    back to the default asyncio loop otherwise.
+
+    Args:
+        main: The coroutine to run
+
+    Returns:
+        The coroutine's result
+    """
+    if sys.platform == "win32":
+        return asyncio.run(main)
+
+    import uvloop
+
+    return uvloop.run(main)
@@ -1,22 +1,40 @@
-from typing import Optional
-import requests
-from bs4 import BeautifulSoup
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import DefaultAzureCredential
-from dotenv import load_dotenv
+import re
+from curl_cffi.curl import CURL_WRITEFUNC_ERROR
+from curl_cffi.requests.exceptions import RequestException
+from selectolax.lexbor import LexborHTMLParser
 
-load_dotenv()
+from joker_agent.http_client import get_session
+from joker_agent.tool_cache import cached_tool
 
 
 # Maximum content length to avoid token limits
 MAX_CONTENT_LENGTH = 8000
+# Stop downloading after this many bytes; markup is roughly 25x the visible text
+MAX_DOWNLOAD_BYTES = 200 * 1024
 
-SYSTEM_PROMPT = """You are an agent that retrieves website content. 
-When given a URL, use the get_website_content tool to fetch the content and return it.
-Extract and return the main text content from the website."""
+# Runs of whitespace collapsed to a single space
+_WS = re.compile(r"\s+")
+# <meta charset> or http-equiv Content-Type declaration; bounded so it stays linear
+_META_CHARSET = re.compile(rb"<meta\b[^>]{0,200}?charset\s*=\s*[\"']?\s*([\w.:-]+)", re.I)
+# Browsers only honour a meta charset within the first 1024 bytes
+META_CHARSET_SCAN_BYTES = 1024
 
 
-def get_website_content(url: str) -> str:
+def _is_content(text: str) -> bool:
+    """Return whether a fetch result is page content rather than an error message."""
+    return bool(text) and not text.startswith("Error ")
+
+
+def _decode(body: bytearray, charset: str) -> str:
+    """Decode a response body, falling back to UTF-8 for unknown charsets."""
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+@cached_tool(ttl=86400, cache_if=_is_content)
+async def get_website_content(url: str) -> str:
     """Fetch and extract text content from a website URL.
     
     Args:
@@ -26,29 +44,51 @@ def get_website_content(url: str) -> str:
         The extracted text content from the website
     """
     try:
-        # Set a user-agent to avoid being blocked
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        }
-        
-        # Fetch the webpage with timeout
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        body = bytearray()
         
-        # Parse HTML content
-        soup = BeautifulSoup(response.content, 'lxml')
+        def collect(chunk: bytes) -> int:
+            # Returning an error from the write callback makes curl abort the transfer
+            body.extend(chunk)
+            return CURL_WRITEFUNC_ERROR if len(body) >= MAX_DOWNLOAD_BYTES else len(chunk)
         
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
+        # Fetch the webpage with timeout without blocking the event loop,
+        # stopping once there is enough to fill MAX_CONTENT_LENGTH
+        try:
+            response = await get_session().get(url, content_callback=collect)
+        except RequestException as e:
+            if len(body) < MAX_DOWNLOAD_BYTES or e.response is None:
+                raise
+            response = e.response
+        response.raise_for_status()
+        # Pages served without a Content-Type are almost always HTML
+        content_type = response.headers.get("content-type", "")
+        is_html = not content_type or "html" in content_type
+        charset = response.charset_encoding
         
-        # Get text content
-        text = soup.get_text()
+        if is_html:
+            # Without a charset in the header, use the page's own declaration
+            if charset is None:
+                match = _META_CHARSET.search(body, 0, META_CHARSET_SCAN_BYTES)
+                charset = match[1].decode("ascii") if match else None
+            
+            # Parse HTML content
+            tree = LexborHTMLParser(_decode(body, charset or "utf-8"))
+            
+            # Remove script, style and other non-content elements
+            for node in tree.css("script, style, nav, footer, header"):
+                node.decompose()
+            
+            # Get text content
+            root = tree.body or tree.root
+            text = root.text(separator=" ") if root is not None else ""
+        else:
+            # Non-HTML content needs no parsing
+            text = _decode(body, charset or "utf-8")
         
         # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+        text = _WS.sub(" ", text).strip()
+        if not text:
+            return f"Error processing content: no readable text found at {url}"
         
         # Limit content length to avoid token limits
         if len(text) > MAX_CONTENT_LENGTH:
@@ -56,32 +96,18 @@ def get_website_content(url: str) -> str:
         
         return text
     
-    except requests.exceptions.RequestException as e:
+    except RequestException as e:
         return f"Error fetching URL: {str(e)}"
     except Exception as e:
         return f"Error processing content: {str(e)}"
 
 
 class GetContentAgent:
-    """Agent that retrieves website content from a given URL."""
+    """Agent that retrieves website content from a given URL.
     
-    def __init__(self, *, credential: Optional[DefaultAzureCredential] = None) -> None:
-        """Initialize the Get Content Agent with web scraping capability.
-        
-        Args:
-            credential: Azure credential for authentication. Defaults to DefaultAzureCredential.
-        """
-        self.credential = credential or DefaultAzureCredential()
-        # Initialize the Azure OpenAI Chat Client
-        self.client = AzureOpenAIChatClient(
-            credential=self.credential, 
-            endpoint="https://hosted-agent-deployment.services.ai.azure.com"
-        )
-        # Create agent with system instructions and register the get_website_content function as a tool
-        self.agent = self.client.create_agent(
-            instructions=SYSTEM_PROMPT,
-            tools=[get_website_content]  # Register the get_website_content function as a tool
-        )
+    Fetching is deterministic, so the agent calls get_website_content
+    directly instead of routing the request through the model.
+    """
 
     async def run(self, url: str) -> str:
         """Run the agent with a URL to fetch its content.
@@ -92,6 +118,4 @@ class GetContentAgent:
         Returns:
             The extracted website content as a string
         """
-        prompt = f"Please fetch and return the content from this URL: {url}"
-        response = await self.agent.run(prompt)
-        return response.text if response.text else ""
+        return await get_website_content(url)
@@ -0,0 +1,57 @@
+from typing import Optional
+import asyncio
+import atexit
+
+from curl_cffi.requests import AsyncSession
+
+
+# Browser whose TLS and HTTP fingerprint requests impersonate, so sites don't block the fetch
+IMPERSONATE = "chrome120"
+# Connection pool settings for the shared HTTP session
+MAX_CONNECTIONS = 100
+REQUEST_TIMEOUT = 10
+
+_SESSION: Optional[AsyncSession] = None
+_SESSION_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_session() -> AsyncSession:
+    """Return the shared HTTP session, creating it on first use.
+
+    The session is created lazily because its libcurl handles are bound to
+    the running event loop, which does not exist yet at import time. It
+    sends the same headers and TLS fingerprint as a real browser, so no
+    User-Agent needs to be set per request.
+
+    Returns:
+        The module-level curl_cffi async session
+    """
+    global _SESSION, _SESSION_LOOP
+    loop = asyncio.get_running_loop()
+    if _SESSION is None or _SESSION_LOOP is not loop:
+        _SESSION = AsyncSession(
+            impersonate=IMPERSONATE,
+            max_clients=MAX_CONNECTIONS,
+            timeout=REQUEST_TIMEOUT,
+            allow_redirects=True,
+        )
+        _SESSION_LOOP = loop
+    return _SESSION
+
+
+async def close_session() -> None:
+    """Close the shared HTTP session if it is open."""
+    global _SESSION, _SESSION_LOOP
+    if _SESSION is not None:
+        await _SESSION.close()
+    _SESSION = None
+    _SESSION_LOOP = None
+
+
+@atexit.register
+def _close_session_at_exit() -> None:
+    """Close the shared HTTP session on interpreter exit if its event loop is still usable."""
+    if _SESSION is None or _SESSION_LOOP is None:
+        return
+    if not _SESSION_LOOP.is_closed() and not _SESSION_LOOP.is_running():
+        _SESSION_LOOP.run_until_complete(close_session())
@@ -0,0 +1,123 @@
+from typing import Any, Optional, Sequence
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+
+import diskcache
+
+
+# Default on-disk location for the local cache backend
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "joker-agent", "llm")
+
+
+class LLMCache:
+    """Response cache for LLM calls keyed by model, instructions, prompt and tools.
+
+    Responses are stored locally with diskcache, or in Redis when a URL is
+    given (or LLM_CACHE_REDIS_URL is set) so several processes can share them.
+    Local cache calls run in a worker thread so they don't block the event
+    loop. Backend failures are counted in ``stats`` and treated as misses,
+    so an unreachable Redis or unwritable cache directory never fails a
+    request.
+    """
+
+    def __init__(self, *, directory: Optional[str] = None, redis_url: Optional[str] = None) -> None:
+        """Initialize the cache backend.
+
+        Args:
+            directory: Directory for the local cache. Defaults to LLM_CACHE_DIR or ~/.cache/joker-agent/llm.
+            redis_url: Redis URL for a shared cache. Defaults to LLM_CACHE_REDIS_URL.
+        """
+        redis_url = redis_url or os.getenv("LLM_CACHE_REDIS_URL")
+        self._redis = None
+        self._disk = None
+        self._errors: tuple = (OSError, sqlite3.Error)
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+        if redis_url:
+            import redis.asyncio as redis
+
+            self._redis = redis.from_url(redis_url)
+            self._errors += (redis.RedisError,)
+        else:
+            try:
+                self._disk = diskcache.Cache(directory or os.getenv("LLM_CACHE_DIR", DEFAULT_CACHE_DIR))
+            except self._errors:
+                # Run without caching rather than failing every agent
+                self.stats["errors"] += 1
+
+    @staticmethod
+    def make_key(*, system_prompt: str, prompt: str, tools: Sequence[str] = ()) -> str:
+        """Build the cache key for an LLM call.
+
+        Args:
+            system_prompt: The agent's system instructions
+            prompt: The user prompt sent to the agent
+            tools: Names of the tools registered with the agent
+
+        Returns:
+            A SHA-256 hex digest identifying the call
+        """
+        payload = {
+            "model": os.getenv("AZURE_OPENAI_CHAT_DEPLOYMENT_NAME", ""),
+            "sys": system_prompt,
+            "prompt": prompt,
+            "tools": list(tools),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a cached response.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        try:
+            if self._redis is not None:
+                raw = await self._redis.get(key)
+            elif self._disk is not None:
+                raw = await asyncio.to_thread(self._disk.get, key)
+            else:
+                raw = None
+            value = None if raw is None else json.loads(raw)
+        except (*self._errors, ValueError):
+            self.stats["errors"] += 1
+            value = None
+
+        if value is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return value
+
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store a response in the cache.
+
+        Args:
+            key: The cache key
+            value: The JSON-serializable response to store
+            ttl: Time to live in seconds. None keeps the entry indefinitely.
+        """
+        raw = json.dumps(value)
+        try:
+            if self._redis is not None:
+                await self._redis.set(key, raw, ex=ttl)
+            elif self._disk is not None:
+                await asyncio.to_thread(self._disk.set, key, raw, expire=ttl)
+        except self._errors:
+            self.stats["errors"] += 1
+
+
+_CACHE: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """Return the process-wide LLM cache, creating it on first use."""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = LLMCache()
+    return _CACHE
@@ -1,13 +1,13 @@
-import asyncio
-
 from joker_agent.agent import JokerAgent
+from joker_agent.event_loop import run
 
 
 async def main() -> None:
     agent = JokerAgent()
-    result = await agent.run("Tell me a joke about a pirate")
-    print(result)
+    async for chunk in agent.run_stream("Tell me a joke about a pirate"):
+        print(chunk, end="", flush=True)
+    print()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
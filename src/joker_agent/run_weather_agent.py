@@ -1,5 +1,4 @@
-import asyncio
-
+from joker_agent.event_loop import run
 from joker_agent.weather_agent import WeatherAgent
 
 
@@ -20,11 +19,13 @@ async def main() -> None:
     
     for prompt in prompts:
         print(f"\n🔵 User: {prompt}")
-        result = await agent.run(prompt)
-        print(f"🤖 Agent: {result}")
+        print("🤖 Agent: ", end="", flush=True)
+        async for chunk in agent.run_stream(prompt):
+            print(chunk, end="", flush=True)
+        print()
     
     print("\n" + "=" * 60)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
@@ -1,5 +1,5 @@
-import asyncio
-
+from joker_agent.event_loop import run
+from joker_agent.http_client import close_session
 from joker_agent.website_summarizer_workflow import WebsiteSummarizerWorkflow
 
 
@@ -20,23 +20,29 @@ async def main() -> None:
         # Add more URLs as needed for testing
     ]
     
-    for url in test_urls:
-        try:
-            # Run the workflow
-            summary = await workflow.run(url, verbose=True)
-            
-            # Display the results
+    # Fetch all URLs concurrently and summarize them in a single model call
+    try:
+        summaries = await workflow.run_batch(test_urls)
+    except Exception as e:
+        print(f"❌ Error processing URLs: {str(e)}")
+        print("=" * 60)
+        print()
+        return
+    finally:
+        await close_session()
+    
+    for url, summary in zip(test_urls, summaries):
+        # Display the results
+        print(f"🌐 URL: {url}\n")
+        if isinstance(summary, Exception):
+            print(f"❌ Error processing URL: {str(summary)}")
+        else:
             print("📋 Summary:")
             print(summary)
-            print()
-            print("=" * 60)
-            print()
-            
-        except Exception as e:
-            print(f"❌ Error processing {url}: {str(e)}")
-            print("=" * 60)
-            print()
+        print()
+        print("=" * 60)
+        print()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
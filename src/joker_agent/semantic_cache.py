@@ -0,0 +1,189 @@
+from typing import List, Optional, Tuple
+import asyncio
+import json
+import os
+import tempfile
+import time
+import zipfile
+
+import faiss
+import numpy as np
+from azure.identity import get_bearer_token_provider
+from openai import AsyncAzureOpenAI
+
+from joker_agent.azure_client import AZURE_ENDPOINT, COGNITIVE_SERVICES_SCOPE, get_shared_credential
+
+
+# Default on-disk location for the index and the cached values
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "joker-agent", "semantic")
+# Cosine similarity above which two inputs are treated as the same
+SIMILARITY_THRESHOLD = 0.95
+# Entries older than this are ignored, matching the LLM cache's summary TTL
+DEFAULT_TTL = 3600
+# Oldest entries are dropped beyond this many
+MAX_ENTRIES = 5000
+# Only the start of the input is embedded; it identifies the page well enough
+MAX_EMBED_CHARS = 2000
+
+
+class SemanticCache:
+    """Cache that returns a stored value when a new input is close to a previous one.
+
+    Inputs are embedded with an Azure OpenAI embedding deployment and kept
+    in a FAISS inner-product index over normalized vectors, so the index
+    score is the cosine similarity. Entries expire after a TTL and only the
+    newest MAX_ENTRIES are kept. After each insert the vectors and values
+    are written together to one file, which is swapped in atomically so a
+    crash or a concurrent writer never leaves them out of step. Failures to
+    embed or persist are counted in ``stats`` and treated as misses, so a
+    missing embedding deployment or unwritable cache directory never fails
+    a summary.
+    """
+
+    def __init__(
+        self,
+        deployment: str,
+        *,
+        directory: Optional[str] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        ttl: float = DEFAULT_TTL,
+        max_entries: int = MAX_ENTRIES,
+    ) -> None:
+        """Initialize the cache and load any persisted entries.
+
+        Args:
+            deployment: Name of the Azure OpenAI embedding deployment
+            directory: Directory for the persisted index. Defaults to SEMANTIC_CACHE_DIR or ~/.cache/joker-agent/semantic.
+            threshold: Minimum cosine similarity for a cache hit
+            ttl: Seconds after which an entry is no longer returned
+            max_entries: Maximum number of entries kept
+        """
+        self.deployment = deployment
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.directory = directory or os.getenv("SEMANTIC_CACHE_DIR", DEFAULT_CACHE_DIR)
+        self._path = os.path.join(self.directory, "cache.npz")
+        self._client = AsyncAzureOpenAI(
+            azure_endpoint=AZURE_ENDPOINT,
+            azure_ad_token_provider=get_bearer_token_provider(get_shared_credential(), COGNITIVE_SERVICES_SCOPE),
+            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2024-10-21"),
+        )
+        self._index: Optional[faiss.IndexFlatIP] = None
+        # (value, creation time) per index row, oldest first
+        self._entries: List[Tuple[str, float]] = []
+        self._save_lock = asyncio.Lock()
+        self._load()
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+
+    async def embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed the start of a text as a normalized row vector.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            A float32 array of shape (1, dimensions), or None if the embedding request failed
+        """
+        try:
+            response = await self._client.embeddings.create(model=self.deployment, input=text[:MAX_EMBED_CHARS])
+        except Exception:
+            # Throttling, auth or deployment errors just skip the cache
+            self.stats["errors"] += 1
+            return None
+        embedding = np.asarray([response.data[0].embedding], dtype="float32")
+        faiss.normalize_L2(embedding)
+        return embedding
+
+    def search(self, embedding: np.ndarray) -> Optional[str]:
+        """Return the value stored for the closest previous input, if it is close enough.
+
+        Args:
+            embedding: The embedding returned by ``embed``
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if self._index is not None and self._index.ntotal:
+            scores, ids = self._index.search(embedding, 1)
+            if scores[0][0] >= self.threshold:
+                value, created = self._entries[ids[0][0]]
+                if created > time.time() - self.ttl:
+                    self.stats["hits"] += 1
+                    return value
+        self.stats["misses"] += 1
+        return None
+
+    async def add(self, embedding: np.ndarray, value: str) -> None:
+        """Store a value for an input and persist the cache.
+
+        Args:
+            embedding: The embedding returned by ``embed``
+            value: The value to return for similar inputs
+        """
+        if self._index is None:
+            self._index = faiss.IndexFlatIP(embedding.shape[1])
+        self._index.add(embedding)
+        self._entries.append((value, time.time()))
+        self._prune()
+
+        async with self._save_lock:
+            # Snapshot on the loop so the write sees a consistent index and entry list
+            vectors = self._index.reconstruct_n(0, self._index.ntotal)
+            try:
+                await asyncio.to_thread(self._save, vectors, list(self._entries))
+            except OSError:
+                # The entry stays usable in memory for this process
+                self.stats["errors"] += 1
+
+    def _prune(self) -> None:
+        """Drop expired entries and the oldest entries beyond max_entries."""
+        cutoff = time.time() - self.ttl
+        drop = max(len(self._entries) - self.max_entries, 0)
+        while drop < len(self._entries) and self._entries[drop][1] <= cutoff:
+            drop += 1
+        if drop:
+            self._index.remove_ids(np.arange(drop, dtype="int64"))
+            del self._entries[:drop]
+
+    def _load(self) -> None:
+        """Read persisted entries, ignoring a missing or unreadable cache file."""
+        try:
+            with np.load(self._path) as data:
+                vectors = data["vectors"]
+                entries = [(value, float(created)) for value, created in json.loads(data["entries"].tobytes())]
+        except (OSError, EOFError, KeyError, ValueError, TypeError, zipfile.BadZipFile):
+            return
+        if len(entries) != len(vectors) or not len(vectors):
+            return
+        self._index = faiss.IndexFlatIP(vectors.shape[1])
+        self._index.add(np.ascontiguousarray(vectors, dtype="float32"))
+        self._entries = entries
+        self._prune()
+
+    def _save(self, vectors: np.ndarray, entries: List[Tuple[str, float]]) -> None:
+        """Write vectors and entries to a temporary file and move it into place."""
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, vectors=vectors, entries=np.frombuffer(json.dumps(entries).encode("utf-8"), dtype=np.uint8))
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+_CACHE: Optional[SemanticCache] = None
+
+
+def get_semantic_cache() -> Optional[SemanticCache]:
+    """Return the process-wide semantic cache, or None if no embedding deployment is configured.
+
+    The cache is enabled by setting AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME.
+    """
+    global _CACHE
+    deployment = os.getenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME")
+    if _CACHE is None and deployment:
+        _CACHE = SemanticCache(deployment)
+    return _CACHE
@@ -1,9 +1,14 @@
-from typing import Optional
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import DefaultAzureCredential
-from dotenv import load_dotenv
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+import asyncio
+import json
+from pydantic import BaseModel
 
-load_dotenv()
+from joker_agent.azure_client import get_shared_client
+from joker_agent.llm_cache import LLMCache, get_llm_cache
+
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
+    from joker_agent.semantic_cache import SemanticCache
 
 
 SYSTEM_PROMPT = """You are an expert content summarizer. Your task is to:
@@ -16,27 +21,56 @@ SYSTEM_PROMPT = """You are an expert content summarizer. Your task is to:
 Format your response as a bulleted list using bullet points (•).
 Each bullet should be a complete, standalone point.
 Aim for 5-8 key points that capture the essence of the content."""
+# Stable key so Azure OpenAI reuses the cached system prompt prefix across requests
+PROMPT_CACHE_KEY = "summarize-sys-v1"
+
+# Cached summaries expire after an hour
+CACHE_TTL = 3600
+
+
+class DocumentSummary(BaseModel):
+    """Summary of one document in a batch."""
+
+    id: int
+    summary: str
+
+
+class BatchSummary(BaseModel):
+    """Structured output of a batched summarization request."""
+
+    summaries: List[DocumentSummary]
 
 
 class SummarizeContentAgent:
     """Agent that summarizes text content into a concise bulleted list."""
     
-    def __init__(self, *, credential: Optional[DefaultAzureCredential] = None) -> None:
+    def __init__(
+        self,
+        *,
+        client: Optional["AzureOpenAIChatClient"] = None,
+        cache: Optional[LLMCache] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
+    ) -> None:
         """Initialize the Summarize Content Agent.
         
         Args:
-            credential: Azure credential for authentication. Defaults to DefaultAzureCredential.
+            client: Azure OpenAI chat client. Defaults to the shared client.
+            cache: Cache for agent responses. Defaults to the shared LLM cache.
+            semantic_cache: Cache matching similar content. Defaults to the shared semantic cache, if configured.
         """
-        self.credential = credential or DefaultAzureCredential()
-        # Initialize the Azure OpenAI Chat Client
-        self.client = AzureOpenAIChatClient(
-            credential=self.credential, 
-            endpoint="https://hosted-agent-deployment.services.ai.azure.com"
-        )
+        # Use the shared Azure OpenAI Chat Client unless one is provided
+        self.client = client or get_shared_client()
         # Create agent with system instructions for summarization
         self.agent = self.client.create_agent(
-            instructions=SYSTEM_PROMPT
+            instructions=SYSTEM_PROMPT,
+            user=PROMPT_CACHE_KEY,
+            additional_chat_options={"extra_body": {"prompt_cache_key": PROMPT_CACHE_KEY}},
         )
+        self.cache = cache or get_llm_cache()
+        # Imported here so the embedding and FAISS stack only loads when an agent is constructed
+        from joker_agent.semantic_cache import get_semantic_cache
+
+        self.semantic_cache = semantic_cache or get_semantic_cache()
 
     async def run(self, content: str) -> str:
         """Run the agent to summarize the provided content.
@@ -47,6 +81,129 @@ class SummarizeContentAgent:
         Returns:
             A concise bulleted list summary of the content
         """
-        prompt = f"Please summarize the following content into a concise bulleted list:\n\n{content}"
-        response = await self.agent.run(prompt)
-        return response.text if response.text else ""
+        key = _cache_key(content)
+        cached, embedding = await self._lookup(key, content)
+        if cached is not None:
+            return cached
+        return await self._generate(key, content, embedding)
+
+    async def run_stream(self, content: str) -> AsyncIterator[str]:
+        """Run the agent to summarize the provided content, yielding the summary as it is generated.
+        
+        Args:
+            content: The text content to summarize
+            
+        Yields:
+            Chunks of the bulleted list summary
+        """
+        key = _cache_key(content)
+        cached, embedding = await self._lookup(key, content)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async for update in self.agent.run_stream(_summary_prompt(content)):
+            if update.text:
+                chunks.append(update.text)
+                yield update.text
+
+        await self._store(key, embedding, "".join(chunks))
+
+    async def run_batch(self, items: List[Tuple[str, str]]) -> List[Union[str, Exception]]:
+        """Summarize several documents with a single model call.
+        
+        The system prompt and request overhead are paid once for the whole
+        batch instead of once per document. Documents with a cached or
+        semantically similar summary are not sent to the model. Documents
+        the model leaves out of its answer, or all of them if the batch
+        request fails or its answer cannot be parsed, are summarized one at
+        a time instead.
+        
+        Args:
+            items: (url, content) pairs to summarize
+            
+        Returns:
+            One bulleted list summary per item in input order, or the exception raised while summarizing it
+        """
+        keys = [_cache_key(content) for _, content in items]
+        lookups = await asyncio.gather(*(self._lookup(key, content) for key, (_, content) in zip(keys, items)))
+        summaries: List[Union[str, Exception, None]] = [cached for cached, _ in lookups]
+        pending = [index for index, summary in enumerate(summaries) if summary is None]
+
+        if pending:
+            # Documents are identified by their position, which the model cannot rewrite the way it can a URL
+            documents = [{"id": index, "url": items[index][0], "content": items[index][1]} for index in pending]
+            prompt = (
+                "Summarize each of the following documents into a concise bulleted list. "
+                "Return one summary per document, identified by its id. Documents:\n"
+                + json.dumps(documents)
+            )
+            try:
+                response = await self.agent.run(prompt, response_format=BatchSummary)
+                # The framework leaves value unset when the output does not match BatchSummary
+                batch: Optional[BatchSummary] = response.value
+            except Exception:
+                # Context length, rate limit or schema errors fall back to one request per document
+                batch = None
+            by_id: Dict[int, str] = {item.id: item.summary for item in batch.summaries} if batch is not None else {}
+
+            for index in pending:
+                summaries[index] = by_id.get(index) or None
+                await self._store(keys[index], lookups[index][1], summaries[index] or "")
+
+            missing = [index for index in pending if summaries[index] is None]
+            retried = await asyncio.gather(
+                *(self._generate(keys[index], items[index][1], lookups[index][1]) for index in missing),
+                return_exceptions=True,
+            )
+            for index, summary in zip(missing, retried):
+                summaries[index] = summary
+
+        return [summary or "" for summary in summaries]
+
+    async def _lookup(self, key: str, content: str) -> Tuple[Optional[str], Any]:
+        """Look up a summary in the exact and semantic caches.
+        
+        Args:
+            key: The LLM cache key for the content
+            content: The text content to summarize
+            
+        Returns:
+            The cached summary or None, and the content's embedding for storing a new summary
+        """
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached, None
+
+        # Near-duplicate content reuses an earlier summary
+        embedding = None
+        if self.semantic_cache is not None:
+            embedding = await self.semantic_cache.embed(content)
+            if embedding is not None:
+                cached = self.semantic_cache.search(embedding)
+        return cached, embedding
+
+    async def _generate(self, key: str, content: str, embedding: Any) -> str:
+        """Summarize content with the model and cache the result."""
+        response = await self.agent.run(_summary_prompt(content))
+        summary = response.text if response.text else ""
+        await self._store(key, embedding, summary)
+        return summary
+
+    async def _store(self, key: str, embedding: Any, summary: str) -> None:
+        """Cache a non-empty summary in the exact and semantic caches."""
+        if summary:
+            await self.cache.set(key, summary, ttl=CACHE_TTL)
+            if embedding is not None:
+                await self.semantic_cache.add(embedding, summary)
+
+
+def _summary_prompt(content: str) -> str:
+    """Build the prompt asking for a summary of one document."""
+    return f"Please summarize the following content into a concise bulleted list:\n\n{content}"
+
+
+def _cache_key(content: str) -> str:
+    """Build the LLM cache key for summarizing one document."""
+    return LLMCache.make_key(system_prompt=SYSTEM_PROMPT, prompt=_summary_prompt(content))
@@ -0,0 +1,66 @@
+from typing import Any, Callable, Optional
+import functools
+import inspect
+
+from cachetools import TTLCache
+from cachetools.keys import hashkey
+
+
+# Maximum number of cached results per tool
+MAX_CACHE_SIZE = 1024
+
+
+def cached_tool(ttl: float, cache_if: Optional[Callable[[Any], bool]] = None) -> Callable:
+    """Memoize a tool function's results for a limited time.
+
+    Works for both regular and async functions. The wrapper keeps the
+    original name, docstring and signature so it can still be registered
+    as an agent tool, and exposes hit/miss counts as ``cache_stats``.
+
+    Args:
+        ttl: Time to live of cached results in seconds
+        cache_if: Optional predicate deciding whether a result should be cached
+
+    Returns:
+        A decorator that adds caching to the tool function
+    """
+    def decorator(fn: Callable) -> Callable:
+        cache: TTLCache = TTLCache(maxsize=MAX_CACHE_SIZE, ttl=ttl)
+        stats = {"hits": 0, "misses": 0}
+
+        def lookup(args: tuple, kwargs: dict) -> tuple:
+            key = hashkey(fn.__name__, *args, **kwargs)
+            if key in cache:
+                stats["hits"] += 1
+                return key, True, cache[key]
+            stats["misses"] += 1
+            return key, False, None
+
+        def store(key: tuple, result: Any) -> None:
+            if cache_if is None or cache_if(result):
+                cache[key] = result
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                key, hit, result = lookup(args, kwargs)
+                if hit:
+                    return result
+                result = await fn(*args, **kwargs)
+                store(key, result)
+                return result
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key, hit, result = lookup(args, kwargs)
+                if hit:
+                    return result
+                result = fn(*args, **kwargs)
+                store(key, result)
+                return result
+
+        wrapper.cache_stats = stats
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
@@ -1,16 +1,21 @@
-from typing import Optional
-import os
+from typing import TYPE_CHECKING, AsyncIterator, Optional
 
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity import DefaultAzureCredential
-from dotenv import load_dotenv
+from joker_agent.azure_client import get_shared_client
+from joker_agent.llm_cache import LLMCache, get_llm_cache
+from joker_agent.tool_cache import cached_tool
 
-load_dotenv()
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
 
 
 SYSTEM_PROMPT = "You are a helpful assistant that can provide weather information."
+# Stable key so Azure OpenAI reuses the cached system prompt prefix across requests
+PROMPT_CACHE_KEY = "weather-sys-v1"
+# Weather changes, so cached responses expire after a few minutes
+CACHE_TTL = 300
 
 
+@cached_tool(ttl=300)
 def get_weather(location: str) -> str:
     """Get the weather for a given location.
     
@@ -24,23 +29,23 @@ def get_weather(location: str) -> str:
 
 
 class WeatherAgent:
-    def __init__(self, *, credential: Optional[DefaultAzureCredential] = None) -> None:
+    def __init__(self, *, client: Optional["AzureOpenAIChatClient"] = None, cache: Optional[LLMCache] = None) -> None:
         """Initialize the Weather Agent with function calling capability.
         
         Args:
-            credential: Azure credential for authentication. Defaults to DefaultAzureCredential.
+            client: Azure OpenAI chat client. Defaults to the shared client.
+            cache: Cache for agent responses. Defaults to the shared LLM cache.
         """
-        self.credential = credential or DefaultAzureCredential()
-        # Initialize the Azure OpenAI Chat Client
-        self.client = AzureOpenAIChatClient(
-            credential=self.credential, 
-            endpoint="https://hosted-agent-deployment.services.ai.azure.com"
-        )
+        # Use the shared Azure OpenAI Chat Client unless one is provided
+        self.client = client or get_shared_client()
         # Create agent with system instructions and register the get_weather function as a tool
         self.agent = self.client.create_agent(
             instructions=SYSTEM_PROMPT,
-            tools=[get_weather]  # Register the get_weather function as a tool
+            tools=[get_weather],  # Register the get_weather function as a tool
+            user=PROMPT_CACHE_KEY,
+            additional_chat_options={"extra_body": {"prompt_cache_key": PROMPT_CACHE_KEY}},
         )
+        self.cache = cache or get_llm_cache()
 
     async def run(self, user_prompt: str) -> str:
         """Run the agent with a user prompt.
@@ -51,5 +56,38 @@ class WeatherAgent:
         Returns:
             The agent's response as a string
         """
+        key = LLMCache.make_key(system_prompt=SYSTEM_PROMPT, prompt=user_prompt, tools=["get_weather"])
+        cached = await self.cache.get(key)
+        if cached is not None:
+            return cached
+
         response = await self.agent.run(user_prompt)
-        return response.text if response.text else ""
+        text = response.text if response.text else ""
+        if text:
+            await self.cache.set(key, text, ttl=CACHE_TTL)
+        return text
+
+    async def run_stream(self, user_prompt: str) -> AsyncIterator[str]:
+        """Run the agent with a user prompt, yielding the response as it is generated.
+        
+        Args:
+            user_prompt: The user's query or request
+            
+        Yields:
+            Chunks of the agent's response text
+        """
+        key = LLMCache.make_key(system_prompt=SYSTEM_PROMPT, prompt=user_prompt, tools=["get_weather"])
+        cached = await self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        chunks = []
+        async for update in self.agent.run_stream(user_prompt):
+            if update.text:
+                chunks.append(update.text)
+                yield update.text
+
+        text = "".join(chunks)
+        if text:
+            await self.cache.set(key, text, ttl=CACHE_TTL)
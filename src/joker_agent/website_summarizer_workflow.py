@@ -1,89 +1,37 @@
-from typing import Optional
-import requests
-from bs4 import BeautifulSoup
-from azure.identity import DefaultAzureCredential
-from dotenv import load_dotenv
-from agent_framework import Executor, WorkflowBuilder, WorkflowContext, handler
-from agent_framework.azure import AzureOpenAIChatClient
+from typing import TYPE_CHECKING, List, Optional, Union
+import asyncio
+from agent_framework import Executor, Workflow, WorkflowBuilder, WorkflowContext, handler
 
-load_dotenv()
+from joker_agent.azure_client import get_shared_client
+from joker_agent.get_content_agent import get_website_content
+from joker_agent.llm_cache import LLMCache
+from joker_agent.summarize_content_agent import SummarizeContentAgent
 
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
+    from joker_agent.semantic_cache import SemanticCache
 
-# Configuration constants
-MAX_CONTENT_LENGTH = 8000
-USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-HTML_PARSER = 'lxml'
-AZURE_ENDPOINT = "https://hosted-agent-deployment.services.ai.azure.com"
 
-
-def get_website_content(url: str) -> str:
-    """Fetch and extract text content from a website URL.
-    
-    Args:
-        url: The website URL to fetch content from
-        
-    Returns:
-        The extracted text content from the website
-    """
-    try:
-        # Set a user-agent to avoid being blocked
-        headers = {
-            'User-Agent': USER_AGENT
-        }
-        
-        # Fetch the webpage with timeout
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        # Parse HTML content
-        soup = BeautifulSoup(response.content, HTML_PARSER)
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Get text content
-        text = soup.get_text()
-        
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        # Limit content length to avoid token limits
-        if len(text) > MAX_CONTENT_LENGTH:
-            text = text[:MAX_CONTENT_LENGTH] + "... (content truncated)"
-        
-        return text
-    
-    except requests.exceptions.RequestException as e:
-        return f"Error fetching URL: {str(e)}"
-    except Exception as e:
-        return f"Error processing content: {str(e)}"
+# Maximum number of workflow runs in flight at once
+MAX_CONCURRENT_RUNS = 8
+# Default number of fetch and summarize workers in run_many
+DEFAULT_PIPELINE_CONCURRENCY = 4
 
 
 class GetContentExecutor(Executor):
-    """Executor that retrieves website content from a given URL."""
+    """Executor that retrieves website content from a given URL.
     
-    def __init__(self, executor_id: str, credential: Optional[DefaultAzureCredential] = None):
+    Fetching is deterministic, so the executor calls get_website_content
+    directly instead of routing the request through the model.
+    """
+    
+    def __init__(self, executor_id: str):
         """Initialize the Get Content Executor.
         
         Args:
             executor_id: Unique identifier for this executor
-            credential: Azure credential for authentication. Defaults to DefaultAzureCredential.
         """
         super().__init__(id=executor_id)
-        self.credential = credential or DefaultAzureCredential()
-        self.client = AzureOpenAIChatClient(
-            credential=self.credential,
-            endpoint=AZURE_ENDPOINT
-        )
-        self.agent = self.client.create_agent(
-            instructions="""You are an agent that retrieves website content. 
-When given a URL, use the get_website_content tool to fetch the content and return it.
-Extract and return the main text content from the website.""",
-            tools=[get_website_content]
-        )
     
     @handler
     async def process(self, url: str, ctx: WorkflowContext[str]) -> None:
@@ -93,42 +41,35 @@ Extract and return the main text content from the website.""",
             url: The website URL to fetch content from
             ctx: Workflow context for sending messages to next executor
         """
-        prompt = f"Please fetch and return the content from this URL: {url}"
-        response = await self.agent.run(prompt)
-        content = response.text if response.text else ""
+        content = await get_website_content(url)
         
         # Send content to the next executor in the workflow
         await ctx.send_message(content)
 
 
 class SummarizeContentExecutor(Executor):
-    """Executor that summarizes text content into a concise bulleted list."""
+    """Executor that summarizes text content into a concise bulleted list.
+    
+    Summarization, including its caching, is delegated to SummarizeContentAgent.
+    """
     
-    def __init__(self, executor_id: str, credential: Optional[DefaultAzureCredential] = None):
+    def __init__(
+        self,
+        executor_id: str,
+        client: Optional["AzureOpenAIChatClient"] = None,
+        cache: Optional[LLMCache] = None,
+        semantic_cache: Optional["SemanticCache"] = None,
+    ):
         """Initialize the Summarize Content Executor.
         
         Args:
             executor_id: Unique identifier for this executor
-            credential: Azure credential for authentication. Defaults to DefaultAzureCredential.
+            client: Azure OpenAI chat client. Defaults to the shared client.
+            cache: Cache for agent responses. Defaults to the shared LLM cache.
+            semantic_cache: Cache matching similar content. Defaults to the shared semantic cache, if configured.
         """
         super().__init__(id=executor_id)
-        self.credential = credential or DefaultAzureCredential()
-        self.client = AzureOpenAIChatClient(
-            credential=self.credential,
-            endpoint=AZURE_ENDPOINT
-        )
-        self.agent = self.client.create_agent(
-            instructions="""You are an expert content summarizer. Your task is to:
-1. Analyze the provided text content
-2. Extract the key points and main ideas
-3. Create a concise summary in bulleted list format
-4. Focus on the most important information
-5. Keep each bullet point clear and brief
-
-Format your response as a bulleted list using bullet points (•).
-Each bullet should be a complete, standalone point.
-Aim for 5-8 key points that capture the essence of the content."""
-        )
+        self.summarizer = SummarizeContentAgent(client=client, cache=cache, semantic_cache=semantic_cache)
     
     @handler
     async def process(self, content: str, ctx: WorkflowContext[str]) -> None:
@@ -138,9 +79,7 @@ Aim for 5-8 key points that capture the essence of the content."""
             content: The text content to summarize
             ctx: Workflow context for yielding the final output
         """
-        prompt = f"Please summarize the following content into a concise bulleted list:\n\n{content}"
-        response = await self.agent.run(prompt)
-        summary = response.text if response.text else ""
+        summary = await self.summarizer.run(content)
         
         # Yield the final output of the workflow
         await ctx.yield_output(summary)
@@ -154,23 +93,30 @@ class WebsiteSummarizerWorkflow:
     2. Summarize Content Executor: Creates a concise bulleted summary
     """
     
-    def __init__(self, *, credential: Optional[DefaultAzureCredential] = None) -> None:
+    def __init__(self, *, client: Optional["AzureOpenAIChatClient"] = None) -> None:
         """Initialize the workflow with WorkflowBuilder.
         
         Args:
-            credential: Azure credential for authentication. Defaults to DefaultAzureCredential.
+            client: Azure OpenAI chat client shared by both executors. Defaults to the shared client.
         """
-        self.credential = credential or DefaultAzureCredential()
+        self.client = client or get_shared_client()
+        # Cap concurrent runs to stay within the Azure OpenAI rate limit
+        self.sem = asyncio.Semaphore(MAX_CONCURRENT_RUNS)
+    
+    def _build_workflow(self) -> Workflow:
+        """Build a workflow instance using WorkflowBuilder.
         
-        # Build the workflow using WorkflowBuilder
-        self.workflow = (
+        A workflow instance can only execute one run at a time, so each run
+        builds its own instance from the registered executor factories.
+        """
+        return (
             WorkflowBuilder(name="WebsiteSummarizer", description="Fetch and summarize website content")
             .register_executor(
-                lambda: GetContentExecutor("get_content", credential=self.credential),
+                lambda: GetContentExecutor("get_content"),
                 name="GetContent"
             )
             .register_executor(
-                lambda: SummarizeContentExecutor("summarize", credential=self.credential),
+                lambda: SummarizeContentExecutor("summarize", client=self.client),
                 name="Summarize"
             )
             .add_edge("GetContent", "Summarize")
@@ -193,13 +139,87 @@ class WebsiteSummarizerWorkflow:
             print("📥 Running workflow: GetContent → Summarize\n")
         
         # Run the workflow with the URL as input
-        events = await self.workflow.run(url)
+        async with self.sem:
+            events = await self._build_workflow().run(url)
         
         # Get the output from the workflow
         outputs = events.get_outputs()
         summary = outputs[0] if outputs else ""
         
         if verbose:
-            print("✓ Workflow completed successfully\n")
+            stats = get_website_content.cache_stats
+            print(f"✓ Workflow completed successfully (content cache: {stats['hits']} hits, {stats['misses']} misses)\n")
         
         return summary
+    
+    async def run_many(
+        self,
+        urls: List[str],
+        concurrency: int = DEFAULT_PIPELINE_CONCURRENCY,
+    ) -> List[Union[str, Exception]]:
+        """Fetch and summarize several URLs as a producer-consumer pipeline.
+        
+        Fetch workers put page content on a bounded queue while summarize
+        workers consume it, so the next page is downloaded while the current
+        one is summarized. Memory is bounded by the queue size times
+        MAX_CONTENT_LENGTH.
+        
+        Args:
+            urls: The website URLs to process
+            concurrency: Number of fetch workers, summarize workers, and queue slots
+            
+        Returns:
+            One summary per URL in input order, or the exception raised while summarizing it
+            
+        Raises:
+            ValueError: If concurrency is less than 1
+        """
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        pending = iter(enumerate(urls))
+        results: List[Union[str, Exception]] = [""] * len(urls)
+        summarizer = SummarizeContentAgent(client=self.client)
+        
+        async def fetch_worker() -> None:
+            for index, url in pending:
+                try:
+                    content = await get_website_content(url)
+                except Exception as e:
+                    results[index] = e
+                    continue
+                await queue.put((index, content))
+        
+        async def fetch_all() -> None:
+            await asyncio.gather(*(fetch_worker() for _ in range(concurrency)))
+            # Tell every summarize worker that no more content is coming
+            for _ in range(concurrency):
+                await queue.put(None)
+        
+        async def summarize_worker() -> None:
+            while (item := await queue.get()) is not None:
+                index, content = item
+                try:
+                    results[index] = await summarizer.run(content)
+                except Exception as e:
+                    results[index] = e
+        
+        await asyncio.gather(fetch_all(), *(summarize_worker() for _ in range(concurrency)))
+        return results
+    
+    async def run_batch(self, urls: List[str]) -> List[Union[str, Exception]]:
+        """Fetch several URLs concurrently and summarize them in one model call.
+        
+        Suited to small batches whose combined content fits in one request;
+        use run_many for larger batches.
+        
+        Args:
+            urls: The website URLs to process
+            
+        Returns:
+            One summary per URL in input order, or the exception raised while summarizing it
+        """
+        contents = await asyncio.gather(*(get_website_content(url) for url in urls))
+        summarizer = SummarizeContentAgent(client=self.client)
+        return await summarizer.run_batch(list(zip(urls, contents)))
@@ -0,0 +1,131 @@
+import json
+import os
+import stat
+import time
+
+import pytest
+from azure.core.credentials import AccessToken
+
+from joker_agent import azure_client
+from joker_agent.azure_client import TOKEN_REFRESH_MARGIN, CachedTokenCredential
+
+SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+class FakeCredential:
+    """Credential that hands out numbered tokens and records each call."""
+
+    def __init__(self, lifetime: int = 3600) -> None:
+        self.lifetime = lifetime
+        self.calls = []
+
+    def get_token(self, *scopes, **kwargs):
+        self.calls.append((scopes, kwargs))
+        return AccessToken(f"token-{len(self.calls)}", int(time.time()) + self.lifetime)
+
+    def close(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_identity(tmp_path, monkeypatch):
+    """Keep the developer's Azure CLI login and AZURE_* settings out of the tests."""
+    monkeypatch.setenv("AZURE_CONFIG_DIR", str(tmp_path / "azure"))
+    for name in ("AZURE_CLIENT_ID", "AZURE_TENANT_ID", "AZURE_USERNAME"):
+        monkeypatch.delenv(name, raising=False)
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "tokens.json")
+
+
+def write_cli_profile(tmp_path, user: str) -> None:
+    os.makedirs(tmp_path / "azure", exist_ok=True)
+    profile = {"subscriptions": [{"isDefault": True, "user": {"name": user}, "tenantId": "tenant"}]}
+    # The Azure CLI writes this file with a UTF-8 byte order mark
+    (tmp_path / "azure" / "azureProfile.json").write_text(json.dumps(profile), encoding="utf-8-sig")
+
+
+def test_reuses_token_until_refresh_margin(cache_path):
+    inner = FakeCredential()
+    cred = CachedTokenCredential(inner, path=cache_path)
+
+    assert cred.get_token(SCOPE).token == "token-1"
+    assert cred.get_token(SCOPE).token == "token-1"
+    assert len(inner.calls) == 1
+
+
+def test_refreshes_token_inside_refresh_margin(cache_path):
+    inner = FakeCredential(lifetime=TOKEN_REFRESH_MARGIN - 1)
+    cred = CachedTokenCredential(inner, path=cache_path)
+
+    assert cred.get_token(SCOPE).token == "token-1"
+    assert cred.get_token(SCOPE).token == "token-2"
+
+
+def test_persisted_token_is_reused_by_new_instance(cache_path):
+    CachedTokenCredential(FakeCredential(), path=cache_path).get_token(SCOPE)
+    inner = FakeCredential()
+
+    assert CachedTokenCredential(inner, path=cache_path).get_token(SCOPE).token == "token-1"
+    assert inner.calls == []
+    assert stat.S_IMODE(os.stat(cache_path).st_mode) == 0o600
+
+
+def test_expired_persisted_token_is_not_reused(cache_path):
+    CachedTokenCredential(FakeCredential(lifetime=-10), path=cache_path).get_token(SCOPE)
+    inner = FakeCredential()
+
+    CachedTokenCredential(inner, path=cache_path).get_token(SCOPE)
+
+    assert len(inner.calls) == 1
+
+
+def test_claims_bypass_cache(cache_path):
+    inner = FakeCredential()
+    cred = CachedTokenCredential(inner, path=cache_path)
+    cred.get_token(SCOPE)
+
+    assert cred.get_token(SCOPE, claims='{"access_token": {}}').token == "token-2"
+    assert inner.calls[1][1]["claims"] == '{"access_token": {}}'
+    # The claims token does not replace the cached one
+    assert cred.get_token(SCOPE).token == "token-1"
+
+
+@pytest.mark.parametrize("content", ["{not json", '["a", "b"]', '{"key": 5}', ""])
+def test_corrupt_cache_file_is_ignored(cache_path, content):
+    with open(cache_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    inner = FakeCredential()
+    cred = CachedTokenCredential(inner, path=cache_path)
+
+    assert cred.get_token(SCOPE).token == "token-1"
+    with open(cache_path, encoding="utf-8") as f:
+        assert len(json.load(f)) == 1
+
+
+def test_switching_cli_account_fetches_new_token(tmp_path, cache_path):
+    write_cli_profile(tmp_path, "alice@example.com")
+    inner = FakeCredential()
+    cred = CachedTokenCredential(inner, path=cache_path)
+    assert cred.get_token(SCOPE).token == "token-1"
+
+    write_cli_profile(tmp_path, "bob@example.com")
+    assert cred.get_token(SCOPE).token == "token-2"
+
+
+def test_switching_client_id_fetches_new_token(cache_path, monkeypatch):
+    inner = FakeCredential()
+    cred = CachedTokenCredential(inner, path=cache_path)
+    cred.get_token(SCOPE)
+
+    monkeypatch.setenv("AZURE_CLIENT_ID", "other-app")
+    assert cred.get_token(SCOPE).token == "token-2"
+
+
+def test_identity_tolerates_malformed_cli_profile(tmp_path):
+    os.makedirs(tmp_path / "azure")
+    (tmp_path / "azure" / "azureProfile.json").write_text('{"subscriptions": [1]}', encoding="utf-8")
+
+    assert azure_client._identity() == "||"
@@ -0,0 +1,128 @@
+import asyncio
+import resource
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from joker_agent.get_content_agent import MAX_DOWNLOAD_BYTES, get_website_content
+from joker_agent.http_client import close_session
+
+PAGES = {
+    "/html": ("text/html; charset=utf-8", b"<html><head><script>x()</script></head><body><nav>menu</nav><p>Hello   world</p></body></html>"),
+    "/untyped": (None, b"<p>no content type</p>"),
+    "/latin1": ("text/html; charset=iso-8859-1", "<p>café crème</p>".encode("latin-1")),
+    "/meta-charset": ("text/html", '<html><head><meta charset="windows-1252"></head><body><p>naïve “quotes”</p></body></html>'.encode("cp1252")),
+    "/unknown-charset": ("text/html; charset=no-such-codec", "<p>café</p>".encode("utf-8")),
+    "/text": ("text/plain", b"<p> is literal here"),
+    "/empty": ("text/html", b"<html><head><script>" + b"x" * (2 * MAX_DOWNLOAD_BYTES) + b"</script></head><body><p>late</p></body></html>"),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        if self.path in ("/endless", "/drip"):
+            return self.send_endless(delay=1.0 if self.path == "/drip" else 0.0)
+        content_type, body = PAGES[self.path]
+        self.send_response(200)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_endless(self, delay: float) -> None:
+        """Send an unbounded chunked body; /drip slows to one chunk per second after the cap."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        chunk = b"<p>" + b"x" * 16380 + b"</p>"
+        sent = 0
+        try:
+            while True:
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                sent += len(chunk)
+                if delay and sent > MAX_DOWNLOAD_BYTES:
+                    time.sleep(delay)
+        except OSError:
+            # The client hung up, which is what the tests expect
+            self.close_connection = True
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+@pytest.fixture(scope="module")
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    get_website_content.cache_clear()
+
+
+def fetch(url: str) -> str:
+    async def main() -> str:
+        try:
+            # A hung download fails the test instead of stalling the suite
+            return await asyncio.wait_for(get_website_content(url), timeout=10)
+        finally:
+            await close_session()
+
+    return asyncio.run(main())
+
+
+def test_html_is_parsed_and_non_content_removed(server):
+    assert fetch(server + "/html") == "Hello world"
+
+
+def test_missing_content_type_is_parsed_as_html(server):
+    assert fetch(server + "/untyped") == "no content type"
+
+
+def test_header_charset_is_used_for_html(server):
+    assert fetch(server + "/latin1") == "café crème"
+
+
+def test_meta_charset_is_used_without_header_charset(server):
+    assert fetch(server + "/meta-charset") == "naïve “quotes”"
+
+
+def test_unknown_charset_falls_back_to_utf8(server):
+    assert fetch(server + "/unknown-charset") == "café"
+
+
+def test_non_html_is_returned_as_text(server):
+    assert fetch(server + "/text") == "<p> is literal here"
+
+
+def test_empty_extraction_is_an_error_and_not_cached(server):
+    hits = get_website_content.cache_stats["hits"]
+    result = fetch(server + "/empty")
+
+    assert result.startswith("Error processing content: no readable text")
+    fetch(server + "/empty")
+    assert get_website_content.cache_stats["hits"] == hits
+
+
+@pytest.mark.parametrize("path", ["/endless", "/drip"])
+def test_download_stops_at_cap(server, path):
+    start = time.monotonic()
+    peak_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    result = fetch(server + path)
+
+    assert result.startswith("x" * 100)
+    assert time.monotonic() - start < 3
+    # ru_maxrss is in KiB on Linux; an uncapped download grows by hundreds of MiB
+    assert resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - peak_before < 50 * 1024
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from joker_agent.llm_cache import LLMCache
+
+
+def test_round_trip(tmp_path):
+    cache = LLMCache(directory=str(tmp_path))
+
+    async def main():
+        await cache.set("key", {"text": "hello"}, ttl=60)
+        return await cache.get("key"), await cache.get("other")
+
+    assert asyncio.run(main()) == ({"text": "hello"}, None)
+    assert cache.stats == {"hits": 1, "misses": 1, "errors": 0}
+
+
+def test_make_key_depends_on_prompt_and_tools():
+    key = LLMCache.make_key(system_prompt="sys", prompt="hi")
+
+    assert key == LLMCache.make_key(system_prompt="sys", prompt="hi")
+    assert key != LLMCache.make_key(system_prompt="sys", prompt="hello")
+    assert key != LLMCache.make_key(system_prompt="sys", prompt="hi", tools=["get_weather"])
+
+
+def test_unusable_directory_disables_caching(tmp_path):
+    # A path below a regular file can never be created
+    (tmp_path / "file").write_text("")
+    cache = LLMCache(directory=str(tmp_path / "file" / "llm"))
+
+    async def main():
+        await cache.set("key", "value")
+        return await cache.get("key")
+
+    assert asyncio.run(main()) is None
+    assert cache.stats["errors"] == 1
+
+
+def test_backend_errors_are_misses(tmp_path):
+    cache = LLMCache(directory=str(tmp_path))
+
+    class BrokenDisk:
+        def get(self, key):
+            raise OSError("disk gone")
+
+        def set(self, key, value, expire=None):
+            raise OSError("disk gone")
+
+    cache._disk = BrokenDisk()
+
+    async def main():
+        await cache.set("key", "value")
+        return await cache.get("key")
+
+    assert asyncio.run(main()) is None
+    assert cache.stats == {"hits": 0, "misses": 1, "errors": 2}
+
+
+def test_unreachable_redis_is_a_miss():
+    pytest.importorskip("redis")
+    cache = LLMCache(redis_url="redis://127.0.0.1:1/0")
+
+    async def main():
+        await cache.set("key", "value")
+        return await cache.get("key")
+
+    assert asyncio.run(main()) is None
+    assert cache.stats["errors"] == 2
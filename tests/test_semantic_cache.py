@@ -0,0 +1,92 @@
+import asyncio
+import os
+
+import numpy as np
+import pytest
+
+from joker_agent.semantic_cache import SemanticCache
+
+
+def vector(*values: float) -> np.ndarray:
+    embedding = np.asarray([values], dtype="float32")
+    return embedding / np.linalg.norm(embedding)
+
+
+@pytest.fixture
+def make_cache(tmp_path):
+    def make(**kwargs) -> SemanticCache:
+        return SemanticCache("embeddings", directory=str(tmp_path), **kwargs)
+
+    return make
+
+
+def test_similar_input_hits_and_distinct_input_misses(make_cache):
+    cache = make_cache()
+    asyncio.run(cache.add(vector(1, 0, 0), "first"))
+
+    assert cache.search(vector(1, 0.01, 0)) == "first"
+    assert cache.search(vector(0, 1, 0)) is None
+    assert cache.stats == {"hits": 1, "misses": 1, "errors": 0}
+
+
+def test_entries_persist_across_instances(make_cache):
+    asyncio.run(make_cache().add(vector(1, 0, 0), "first"))
+
+    assert make_cache().search(vector(1, 0, 0)) == "first"
+
+
+def test_expired_entries_are_not_returned(make_cache, monkeypatch):
+    cache = make_cache(ttl=60)
+    asyncio.run(cache.add(vector(1, 0, 0), "first"))
+
+    monkeypatch.setattr("joker_agent.semantic_cache.time.time", lambda: 1e12)
+    assert cache.search(vector(1, 0, 0)) is None
+    assert make_cache(ttl=60).search(vector(1, 0, 0)) is None
+
+
+def test_oldest_entries_are_dropped_beyond_max_entries(make_cache):
+    cache = make_cache(max_entries=2)
+
+    async def fill() -> None:
+        for i, embedding in enumerate([vector(1, 0, 0), vector(0, 1, 0), vector(0, 0, 1)]):
+            await cache.add(embedding, f"value-{i}")
+
+    asyncio.run(fill())
+
+    assert cache.search(vector(1, 0, 0)) is None
+    assert cache.search(vector(0, 1, 0)) == "value-1"
+    assert make_cache().search(vector(0, 0, 1)) == "value-2"
+
+
+@pytest.mark.parametrize("content", [b"", b"not a zip", b"PK\x03\x04truncated"])
+def test_corrupt_cache_file_is_ignored(make_cache, tmp_path, content):
+    (tmp_path / "cache.npz").write_bytes(content)
+    cache = make_cache()
+
+    assert cache.search(vector(1, 0, 0)) is None
+    asyncio.run(cache.add(vector(1, 0, 0), "first"))
+    assert make_cache().search(vector(1, 0, 0)) == "first"
+    assert os.listdir(tmp_path) == ["cache.npz"]
+
+
+def test_embedding_failure_is_counted_and_returns_none(make_cache):
+    cache = make_cache()
+
+    async def fail(**kwargs):
+        raise RuntimeError("deployment not found")
+
+    cache._client.embeddings.create = fail
+
+    assert asyncio.run(cache.embed("text")) is None
+    assert cache.stats["errors"] == 1
+
+
+def test_save_failure_keeps_entry_in_memory(tmp_path):
+    # A directory below a regular file can never be created
+    (tmp_path / "file").write_text("")
+    cache = SemanticCache("embeddings", directory=str(tmp_path / "file" / "semantic"))
+
+    asyncio.run(cache.add(vector(1, 0, 0), "first"))
+
+    assert cache.stats["errors"] == 1
+    assert cache.search(vector(1, 0, 0)) == "first"
@@ -0,0 +1,141 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from joker_agent.llm_cache import LLMCache
+from joker_agent.summarize_content_agent import BatchSummary, SummarizeContentAgent
+
+
+class FakeAgent:
+    """Agent that answers batch prompts with a scripted BatchSummary and single prompts with a fixed text."""
+
+    def __init__(self, batch_value=None) -> None:
+        self.batch_value = batch_value
+        self.prompts = []
+
+    async def run(self, prompt, response_format=None):
+        self.prompts.append(prompt)
+        if response_format is not None:
+            value = self.batch_value(prompt) if callable(self.batch_value) else self.batch_value
+            return SimpleNamespace(text="not json", value=value)
+        return SimpleNamespace(text=f"single:{prompt.rsplit(chr(10), 1)[-1]}", value=None)
+
+
+class FakeClient:
+    def __init__(self, agent: FakeAgent) -> None:
+        self.agent = agent
+
+    def create_agent(self, **kwargs):
+        return self.agent
+
+
+@pytest.fixture(autouse=True)
+def no_semantic_cache(monkeypatch):
+    monkeypatch.delenv("AZURE_OPENAI_EMBEDDING_DEPLOYMENT_NAME", raising=False)
+
+
+def make_agent(tmp_path, batch_value=None):
+    agent = FakeAgent(batch_value)
+    summarizer = SummarizeContentAgent(client=FakeClient(agent), cache=LLMCache(directory=str(tmp_path)))
+    return summarizer, agent
+
+
+def documents_in(prompt: str):
+    return json.loads(prompt.split("Documents:\n", 1)[1])
+
+
+def test_batch_matches_summaries_by_id(tmp_path):
+    def answer(prompt):
+        docs = documents_in(prompt)
+        # Reversed order and rewritten URLs must not matter
+        return BatchSummary(summaries=[{"id": d["id"], "summary": f"batch:{d['content']}"} for d in reversed(docs)])
+
+    summarizer, agent = make_agent(tmp_path, answer)
+    items = [("https://a.example", "alpha"), ("https://b.example", "beta")]
+
+    assert asyncio.run(summarizer.run_batch(items)) == ["batch:alpha", "batch:beta"]
+    assert len(agent.prompts) == 1
+
+
+def test_documents_left_out_are_summarized_individually(tmp_path):
+    summarizer, agent = make_agent(tmp_path, BatchSummary(summaries=[{"id": 0, "summary": "batch:alpha"}]))
+    items = [("https://a.example", "alpha"), ("https://b.example", "beta")]
+
+    assert asyncio.run(summarizer.run_batch(items)) == ["batch:alpha", "single:beta"]
+
+
+def test_unparsable_batch_falls_back_to_individual_summaries(tmp_path):
+    summarizer, agent = make_agent(tmp_path, None)
+    items = [("https://a.example", "alpha"), ("https://b.example", "beta")]
+
+    assert asyncio.run(summarizer.run_batch(items)) == ["single:alpha", "single:beta"]
+
+
+def test_cached_documents_are_not_sent_again(tmp_path):
+    summarizer, agent = make_agent(tmp_path, None)
+    asyncio.run(summarizer.run("alpha"))
+
+    def answer(prompt):
+        return BatchSummary(summaries=[{"id": d["id"], "summary": "batch"} for d in documents_in(prompt)])
+
+    agent.batch_value = answer
+    result = asyncio.run(summarizer.run_batch([("https://a.example", "alpha"), ("https://b.example", "beta")]))
+
+    assert result == ["single:alpha", "batch"]
+    assert [d["id"] for d in documents_in(agent.prompts[-1])] == [1]
+
+
+def test_semantic_cache_failures_do_not_fail_summaries(tmp_path):
+    from joker_agent.semantic_cache import SemanticCache
+
+    (tmp_path / "file").write_text("")
+    semantic = SemanticCache("embeddings", directory=str(tmp_path / "file" / "semantic"))
+
+    async def embed(**kwargs):
+        return SimpleNamespace(data=[SimpleNamespace(embedding=[1.0, 0.0, 0.0])])
+
+    async def fail(**kwargs):
+        raise RuntimeError("throttled")
+
+    agent = FakeAgent()
+    summarizer = SummarizeContentAgent(
+        client=FakeClient(agent), cache=LLMCache(directory=str(tmp_path / "llm")), semantic_cache=semantic
+    )
+
+    # The save fails because the cache directory cannot be created
+    semantic._client.embeddings.create = embed
+    assert asyncio.run(summarizer.run("alpha")) == "single:alpha"
+
+    # The embedding request fails
+    semantic._client.embeddings.create = fail
+    assert asyncio.run(summarizer.run("beta")) == "single:beta"
+    assert asyncio.run(summarizer.run_batch([("https://c.example", "gamma")])) == ["single:gamma"]
+    assert semantic.stats["errors"] == 3
+
+
+def test_failed_batch_request_falls_back_per_document(tmp_path):
+    def answer(prompt):
+        raise RuntimeError("context length exceeded")
+
+    summarizer, agent = make_agent(tmp_path, answer)
+    items = [("https://a.example", "alpha"), ("https://b.example", "beta")]
+
+    assert asyncio.run(summarizer.run_batch(items)) == ["single:alpha", "single:beta"]
+
+
+def test_individual_failures_are_reported_per_document(tmp_path):
+    summarizer, agent = make_agent(tmp_path, None)
+    single = agent.run
+
+    async def run(prompt, response_format=None):
+        if prompt.endswith("beta"):
+            raise RuntimeError("rate limited")
+        return await single(prompt, response_format)
+
+    agent.run = run
+    alpha, beta = asyncio.run(summarizer.run_batch([("https://a.example", "alpha"), ("https://b.example", "beta")]))
+
+    assert alpha == "single:alpha"
+    assert isinstance(beta, RuntimeError)
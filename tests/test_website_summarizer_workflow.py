@@ -0,0 +1,66 @@
+import asyncio
+import random
+
+import pytest
+
+from joker_agent import website_summarizer_workflow
+from joker_agent.website_summarizer_workflow import WebsiteSummarizerWorkflow
+
+
+class FakeSummarizer:
+    """Summarizer that finishes in random order and fails on content containing "bad"."""
+
+    def __init__(self, client=None) -> None:
+        pass
+
+    async def run(self, content: str) -> str:
+        await asyncio.sleep(random.uniform(0, 0.01))
+        if "bad" in content:
+            raise RuntimeError(f"cannot summarize {content}")
+        return f"summary of {content}"
+
+
+@pytest.fixture
+def workflow(monkeypatch):
+    async def get_website_content(url: str) -> str:
+        await asyncio.sleep(random.uniform(0, 0.01))
+        if "unreachable" in url:
+            raise ConnectionError(url)
+        return f"content of {url}"
+
+    monkeypatch.setattr(website_summarizer_workflow, "get_website_content", get_website_content)
+    monkeypatch.setattr(website_summarizer_workflow, "SummarizeContentAgent", FakeSummarizer)
+    return WebsiteSummarizerWorkflow(client=object())
+
+
+def test_results_keep_input_order(workflow):
+    urls = [f"https://{i}.example" for i in range(20)]
+
+    results = asyncio.run(workflow.run_many(urls, concurrency=3))
+
+    assert results == [f"summary of content of {url}" for url in urls]
+
+
+def test_failures_are_returned_per_url(workflow):
+    urls = ["https://a.example", "https://bad.example", "https://unreachable.example", "https://c.example"]
+
+    a, bad, unreachable, c = asyncio.run(workflow.run_many(urls, concurrency=2))
+
+    assert (a, c) == ("summary of content of https://a.example", "summary of content of https://c.example")
+    assert isinstance(bad, RuntimeError)
+    assert isinstance(unreachable, ConnectionError)
+
+
+def test_concurrency_above_url_count(workflow):
+    urls = ["https://a.example", "https://b.example"]
+
+    results = asyncio.run(workflow.run_many(urls, concurrency=10))
+
+    assert results == [f"summary of content of {url}" for url in urls]
+    assert asyncio.run(workflow.run_many([], concurrency=10)) == []
+
+
+@pytest.mark.parametrize("concurrency", [0, -1])
+def test_concurrency_below_one_is_rejected(workflow, concurrency):
+    with pytest.raises(ValueError):
+        asyncio.run(workflow.run_many(["https://a.example"], concurrency=concurrency))